@@ -15,6 +15,7 @@
 from __future__ import print_function, division, absolute_import
 from collections import defaultdict
 import logging
+from multiprocessing import cpu_count
 from subprocess import check_output
 import tempfile
 
@@ -26,7 +27,7 @@ from .unsupported_allele import UnsupportedAllele
 from .process_helpers import run_command
 from .cleanup_context import CleanupFiles
 from .input_file_formats import create_input_peptides_files
-from .process_helpers import run_multiple_commands_redirect_stdout
+from .process_helpers import iter_multiple_commands_capture_stdout
 from .binding_prediction_collection import BindingPredictionCollection
 
 logger = logging.getLogger(__name__)
@@ -49,6 +50,7 @@ class BaseCommandlinePredictor(BasePredictor):
             tempdir_flag=None,
             extra_flags=[],
             max_peptides_per_file=10 ** 4,
+            min_peptides_per_file=10 ** 3,
             process_limit=-1,
             default_peptide_lengths=[9],
             group_peptides_by_length=False,
@@ -94,6 +96,10 @@ class BaseCommandlinePredictor(BasePredictor):
         max_peptides_per_file : int, optional
             Maximum number of lines per file when predicting peptides directly.
 
+        min_peptides_per_file : int, optional
+            Smallest number of lines per file when splitting peptides across
+            more files to keep all the available processes busy.
+
         process_limit : int, optional
             Maximum number of parallel processes to start
             (0 for no limit, -1 for use all available processors)
@@ -142,6 +148,11 @@ class BaseCommandlinePredictor(BasePredictor):
             "Maximum number of lines in a peptides input file")
         self.max_peptides_per_file = max_peptides_per_file
 
+        require_integer(
+            min_peptides_per_file,
+            "Minimum number of lines in a peptides input file")
+        self.min_peptides_per_file = min_peptides_per_file
+
         require_integer(process_limit, "Maximum number of processes")
         self.process_limit = process_limit
 
@@ -184,6 +195,14 @@ class BaseCommandlinePredictor(BasePredictor):
                 additional_message = ""
             raise UnsupportedAllele(str(e) + additional_message)
 
+        # allele names are fixed for the lifetime of the predictor, so
+        # convert them to the predictor's format once instead of once per
+        # generated command
+        self._prepared_allele_names = {
+            allele: self.prepare_allele_name(allele)
+            for allele in self.alleles
+        }
+
     @staticmethod
     def _determine_supported_alleles(command, supported_allele_flag):
         """
@@ -235,7 +254,7 @@ class BaseCommandlinePredictor(BasePredictor):
         args = [self.program_name]
         if peptide_mode:
             args.extend(self.peptide_mode_flags)
-        args.extend([self.allele_flag, self.prepare_allele_name(allele)])
+        args.extend([self.allele_flag, self._prepared_allele_names[allele]])
         if length:
             args.extend([self.length_flag, str(length)])
         if self.tempdir_flag and temp_dirname:
@@ -247,6 +266,23 @@ class BaseCommandlinePredictor(BasePredictor):
             args.append(input_filename)
         return args
 
+    def _peptides_per_file(self, n_peptides):
+        """
+        How many peptides to write to each input file. Each input file gets
+        one command per allele, so when there are fewer alleles than
+        available processes split the peptides across more files to keep
+        the remaining processes busy.
+        """
+        if self.process_limit > 0:
+            n_processes = self.process_limit
+        else:
+            n_processes = cpu_count()
+        n_files = -(-n_processes // len(self.alleles))
+        peptides_per_file = max(
+            -(-n_peptides // n_files),
+            self.min_peptides_per_file)
+        return min(peptides_per_file, self.max_peptides_per_file)
+
     def _run_commands_and_collect_predictions(
             self,
             commands,
@@ -258,40 +294,37 @@ class BaseCommandlinePredictor(BasePredictor):
         binding_predictions = []
 
         # Cleanup either when finished or if an exception gets raised by
-        # deleting the input and output files
-        filenames_to_delete = list(input_filenames) + [
-            f.name for f in commands.keys()]
+        # deleting the input files
         with CleanupFiles(
-                filenames=filenames_to_delete,
+                filenames=input_filenames,
                 directories=temp_dir_list):
-            run_multiple_commands_redirect_stdout(
-                commands,
-                print_commands=True,
-                process_limit=self.process_limit)
-            for output_file, command in commands.items():
-                # closing/opening looks insane
-                # but I was getting empty files otherwise
-                output_file.close()
-                with open(output_file.name, 'r') as f:
-                    file_contents = f.read()
-                    binding_predictions.extend(
-                        self.parse_output_fn(
-                            stdout=file_contents,
-                            sequence_key_mapping=sequence_key_mapping,
-                            prediction_method_name=self.program_name))
+            # parse each output as soon as its command finishes, overlapping
+            # with commands which are still running, but keep the results
+            # in the same order as the commands
+            parsed_outputs = [None] * len(commands)
+            for i, stdout in iter_multiple_commands_capture_stdout(
+                    commands,
+                    print_commands=True,
+                    process_limit=self.process_limit):
+                parsed_outputs[i] = self.parse_output_fn(
+                    stdout=stdout,
+                    sequence_key_mapping=sequence_key_mapping,
+                    prediction_method_name=self.program_name)
+            for predictions in parsed_outputs:
+                binding_predictions.extend(predictions)
 
         if len(binding_predictions) == 0:
-            logger.warning("No binding predictions from %s" % self.program_name)
+            logger.warning("No binding predictions from %s", self.program_name)
         return BindingPredictionCollection(binding_predictions)
 
     def predict_peptides(self, peptides):
         self._check_peptide_inputs(peptides)
         input_filenames = create_input_peptides_files(
             peptides,
-            max_peptides_per_file=self.max_peptides_per_file,
+            max_peptides_per_file=self._peptides_per_file(len(peptides)),
             group_by_length=self.group_peptides_by_length)
-        logger.debug("Created %d input files" % len(input_filenames))
-        commands = {}
+        logger.debug("Created %d input files", len(input_filenames))
+        commands = []
         dirs = []
 
         for i, input_filename in enumerate(input_filenames):
@@ -310,16 +343,11 @@ class BaseCommandlinePredictor(BasePredictor):
                     dirs.append(temp_dirname)
                 else:
                     temp_dirname = None
-                output_file = tempfile.NamedTemporaryFile(
-                    "w",
-                    prefix="%s_output_length_%d_%d" % (
-                        self.program_name, i, j),
-                    delete=False)
-                commands[output_file] = self._build_command(
+                commands.append(self._build_command(
                     input_filename=input_filename,
                     allele=allele,
                     peptide_mode=True,
-                    temp_dirname=temp_dirname)
+                    temp_dirname=temp_dirname))
         results = self._run_commands_and_collect_predictions(
             commands=commands,
             input_filenames=input_filenames,
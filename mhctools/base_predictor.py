@@ -14,10 +14,10 @@ import logging
 from collections import defaultdict
 
 from typechecks import require_iterable_of
-from mhcnames import normalize_allele_name
 
 from .unsupported_allele import UnsupportedAllele
 from .binding_prediction_collection import BindingPredictionCollection
+from .common import cached_normalize_allele_name
 
 logger = logging.getLogger(__name__)
 
@@ -194,15 +194,15 @@ class BasePredictor(object):
         # convert long protein sequences to set of peptides and
         # associated sequence name / offsets that each peptide may have come
         # from
-        peptide_set = set([])
         peptide_to_name_offset_pairs = defaultdict(list)
 
         for name, sequence in sequence_dict.items():
             for peptide_length in peptide_lengths:
                 for i in range(len(sequence) - peptide_length + 1):
-                    peptide = sequence[i:i + peptide_length]
-                    peptide_set.add(peptide)
-                    peptide_to_name_offset_pairs[peptide].append((name, i))
+                    peptide_to_name_offset_pairs[
+                        sequence[i:i + peptide_length]].append((name, i))
+        # the keys of the offsets dictionary are already the unique peptides
+        peptide_set = set(peptide_to_name_offset_pairs)
         peptide_list = sorted(peptide_set)
 
         binding_predictions = self.predict_peptides(peptide_list)
@@ -247,7 +247,7 @@ class BasePredictor(object):
         # Don't run the MHC predictor twice for homozygous alleles,
         # only run it for unique alleles
         alleles = {
-            normalize_allele_name(allele.strip().upper())
+            cached_normalize_allele_name(allele.strip().upper())
             for allele in alleles
         }
         if valid_alleles:
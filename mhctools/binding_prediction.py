@@ -14,6 +14,21 @@ import numpy as np
 from serializable import Serializable
 
 class BindingPrediction(Serializable):
+    # parsers create one of these per predicted peptide/allele pair, so
+    # store the fields in slots. Serializable has no __slots__, so instances
+    # still get a __dict__, but it's left empty and only allocated if
+    # something asks for it
+    __slots__ = (
+        "source_sequence_name",
+        "offset",
+        "allele",
+        "peptide",
+        "score",
+        "percentile_rank",
+        "affinity",
+        "prediction_method_name",
+    )
+
     def __init__(
             self,
             peptide,
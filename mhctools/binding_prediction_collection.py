@@ -26,6 +26,11 @@ class BindingPredictionCollection(Collection):
         """
         Converts collection of BindingPrediction objects to DataFrame
         """
-        return pd.DataFrame.from_records(
-            [tuple([getattr(x, name) for name in columns]) for x in self],
-            columns=columns)
+        if len(self) == 0:
+            # without any values pandas would infer float columns
+            return pd.DataFrame(columns=list(columns))
+        # build each column directly instead of a tuple per row, which
+        # pandas would then have to transpose back into columns
+        return pd.DataFrame(
+            {name: [getattr(x, name) for x in self] for name in columns},
+            columns=list(columns))
@@ -10,6 +10,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import lru_cache
+
+from mhcnames import normalize_allele_name
+
+# predictor outputs and inputs repeat the same few allele names many times
+# (e.g. once per row of output), so only parse each distinct name once
+cached_normalize_allele_name = lru_cache(maxsize=4096)(normalize_allele_name)
+
 def seq_to_str(obj, sep=","):
     """
     Given a sequence convert it to a comma separated string.
@@ -11,6 +11,7 @@
 # limitations under the License.
 
 import logging
+from functools import lru_cache
 
 from numpy import nan
 
@@ -21,6 +22,22 @@ from .unsupported_allele import UnsupportedAllele
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _load_predictor(models_path=None):
+    """
+    Loading MHCflurry models means reading all of their weights from disk,
+    so share one Class1AffinityPredictor between all MHCflurry instances
+    which use the same models directory.
+    """
+    # moving import here since the mhcflurry package imports
+    # Keras and its backend (either Theano or TF) which end up
+    # slowing down responsive for any CLI application using MHCtools
+    from mhcflurry import Class1AffinityPredictor
+    if models_path:
+        logger.info("Loading MHCflurry models from %s", models_path)
+        return Class1AffinityPredictor.load(models_path)
+    return Class1AffinityPredictor.load()
+
 
 class MHCflurry(BasePredictor):
     """
@@ -49,10 +66,6 @@ class MHCflurry(BasePredictor):
             Models dir to use if predictor argument is None
 
         """
-        # moving import here since the mhcflurry package imports
-        # Keras and its backend (either Theano or TF) which end up
-        # slowing down responsive for any CLI application using MHCtools
-        from mhcflurry import Class1AffinityPredictor
         BasePredictor.__init__(
             self,
             alleles=alleles,
@@ -61,11 +74,8 @@ class MHCflurry(BasePredictor):
             max_peptide_length=15)
         if predictor:
             self.predictor = predictor
-        elif models_path:
-            logging.info("Loading MHCflurry models from %s" % models_path)
-            self.predictor = Class1AffinityPredictor.load(models_path)
         else:
-            self.predictor = Class1AffinityPredictor.load()
+            self.predictor = _load_predictor(models_path)
 
         # relying on BasePredictor and MHCflurry to both normalize
         # allele names the same way using mhcnames
@@ -87,14 +97,21 @@ class MHCflurry(BasePredictor):
         for allele in self.alleles:
             predictions_df = self.predictor.predict_to_dataframe(
                 encodable_sequences, allele=allele)
-            for (_, row) in predictions_df.iterrows():
+            if 'prediction_percentile' in predictions_df.columns:
+                percentile_ranks = predictions_df.prediction_percentile
+            else:
+                percentile_ranks = [nan] * len(predictions_df)
+            # read the columns directly rather than building a Series for
+            # every row with iterrows
+            for (peptide, affinity, percentile_rank) in zip(
+                    predictions_df.peptide,
+                    predictions_df.prediction,
+                    percentile_ranks):
                 binding_prediction = BindingPrediction(
                     allele=allele,
-                    peptide=row.peptide,
-                    affinity=row.prediction,
-                    percentile_rank=(
-                        row.prediction_percentile
-                        if 'prediction_percentile' in row else nan),
+                    peptide=peptide,
+                    affinity=affinity,
+                    percentile_rank=percentile_rank,
                     prediction_method_name="mhcflurry")
                 binding_predictions.append(binding_prediction)
         return BindingPredictionCollection(binding_predictions)
@@ -15,13 +15,12 @@ from tempfile import mkdtemp, NamedTemporaryFile
 from os.path import join, exists
 from os import remove
 
-from mhcnames import normalize_allele_name
-
 from .base_predictor import BasePredictor
 from .binding_prediction import BindingPrediction
 from .binding_prediction_collection import BindingPredictionCollection
 from .process_helpers import run_command
 from .cleanup_context import CleanupFiles
+from .common import cached_normalize_allele_name
 
 class MixMHCpred(BasePredictor):
     def __init__(
@@ -94,7 +93,7 @@ class MixMHCpred(BasePredictor):
                         self.program_name,
                         "-i", input_file_path,
                         "-o", output_file_path,
-                        "-a", normalize_allele_name(allele)] + self.extra_commandline_args,
+                        "-a", cached_normalize_allele_name(allele)] + self.extra_commandline_args,
                         suppress_stderr=False,
                         redirect_stdout_file=stdout_file)
                 if exists(output_file_path):
@@ -131,7 +130,7 @@ def parse_mixmhcpred_results(filename):
             df["%Rank_bestAllele"]):
         binding_predictions.append(BindingPrediction(
             peptide=peptide,
-            allele=normalize_allele_name(allele),
+            allele=cached_normalize_allele_name(allele),
             score=score,
             percentile_rank=pr,
             prediction_method_name="mixmhcpred"))
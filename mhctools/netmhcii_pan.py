@@ -23,6 +23,47 @@ from .parsing import parse_netmhciipan_stdout, parse_netmhciipan4_stdout, parse_
 logger = logging.getLogger(__name__)
 
 
+def _prepare_drb_allele_name(parsed_beta_allele):
+    """
+    Assume that we're dealing with a human DRB allele
+    which NetMHCIIpan treats differently because there is
+    little population diversity in the DR-alpha gene
+    """
+    if "DRB" not in parsed_beta_allele.gene:
+        raise ValueError("Unexpected allele %s" % parsed_beta_allele)
+    return "%s_%s%s" % (
+        parsed_beta_allele.gene,
+        parsed_beta_allele.allele_family,
+        parsed_beta_allele.allele_code)
+
+
+def _prepare_allele_name(allele_name):
+    """
+    Convert an allele name into the format expected by netMHCIIpan.
+    """
+    parsed_alleles = parse_classi_or_classii_allele_name(allele_name)
+    if len(parsed_alleles) == 1:
+        allele = parsed_alleles[0]
+        if allele.species == "H-2":
+            return "%s-%s%s" % (
+                allele.species,
+                allele.gene,
+                allele.allele_code)
+        return _prepare_drb_allele_name(allele)
+
+    else:
+        alpha, beta = parsed_alleles
+        if "DRA" in alpha.gene:
+            return _prepare_drb_allele_name(beta)
+        return "HLA-%s%s%s-%s%s%s" % (
+            alpha.gene,
+            alpha.allele_family,
+            alpha.allele_code,
+            beta.gene,
+            beta.allele_family,
+            beta.allele_code)
+
+
 class NetMHCIIpanBase(BaseCommandlinePredictor):
     def __init__(
             self,
@@ -48,19 +89,6 @@ class NetMHCIIpanBase(BaseCommandlinePredictor):
             extra_flags=extra_flags,
             min_peptide_length=9)
 
-    def _prepare_drb_allele_name(self, parsed_beta_allele):
-        """
-        Assume that we're dealing with a human DRB allele
-        which NetMHCIIpan treats differently because there is
-        little population diversity in the DR-alpha gene
-        """
-        if "DRB" not in parsed_beta_allele.gene:
-            raise ValueError("Unexpected allele %s" % parsed_beta_allele)
-        return "%s_%s%s" % (
-            parsed_beta_allele.gene,
-            parsed_beta_allele.allele_family,
-            parsed_beta_allele.allele_code)
-
     def prepare_allele_name(self, allele_name):
         """
         netMHCIIpan has some unique requirements for allele formats,
@@ -73,27 +101,7 @@ class NetMHCIIpanBase(BaseCommandlinePredictor):
          - H-2-IAb
          - H-2-IAd
         """
-        parsed_alleles = parse_classi_or_classii_allele_name(allele_name)
-        if len(parsed_alleles) == 1:
-            allele = parsed_alleles[0]
-            if allele.species == "H-2":
-                return "%s-%s%s" % (
-                    allele.species,
-                    allele.gene,
-                    allele.allele_code)
-            return self._prepare_drb_allele_name(allele)
-
-        else:
-            alpha, beta = parsed_alleles
-            if "DRA" in alpha.gene:
-                return self._prepare_drb_allele_name(beta)
-            return "HLA-%s%s%s-%s%s%s" % (
-                alpha.gene,
-                alpha.allele_family,
-                alpha.allele_code,
-                beta.gene,
-                beta.allele_family,
-                beta.allele_code)
+        return _prepare_allele_name(allele_name)
 
 
 class NetMHCIIpan3(NetMHCIIpanBase):
@@ -121,6 +129,10 @@ class NetMHCIIpan4(NetMHCIIpanBase):
     """
     Wrapper for NetMHCIIpan 4.0, using a different parser.
     """
+    # parser which takes the EL/BA mode as a keyword argument, overridden
+    # by later versions whose output columns differ
+    _mode_parse_output_fn = staticmethod(parse_netmhciipan4_stdout)
+
     def __init__(
             self,
             alleles,
@@ -141,7 +153,7 @@ class NetMHCIIpan4(NetMHCIIpanBase):
             alleles=alleles,
             program_name=program_name,
             process_limit=process_limit,
-            parse_output_fn=partial(parse_netmhciipan4_stdout, mode=mode),
+            parse_output_fn=partial(self._mode_parse_output_fn, mode=mode),
             default_peptide_lengths=default_peptide_lengths,
             extra_flags=['-BA'] + extra_flags)
 
@@ -218,33 +230,12 @@ def NetMHCIIpan(
         raise ValueError("This software expects NetMHCIIpan version 3.x or 4.0")
 
 
-class NetMHCIIpan43(NetMHCIIpanBase):
+class NetMHCIIpan43(NetMHCIIpan4):
     """
     Wrapper for NetMHCIIpan 4.3, using a different parser.
     """
-    def __init__(
-            self,
-            alleles,
-            default_peptide_lengths=[15, 16, 17, 18, 19, 20],
-            program_name="netMHCIIpan",
-            process_limit=-1,
-            mode="elution_score",
-            extra_flags=[]):
+    _mode_parse_output_fn = staticmethod(parse_netmhciipan43_stdout)
 
-        if mode not in ['binding_affinity', 'elution_score']:
-            raise ValueError("Unsupported mode", mode)
-
-        # Always include binding affinity data (-BA flag), though the main score and %rank will
-        # still be EL-based. This gives us access to the BA-based score and %rank columns.
-
-        NetMHCIIpanBase.__init__(
-            self,
-            alleles=alleles,
-            program_name=program_name,
-            process_limit=process_limit,
-            parse_output_fn=partial(parse_netmhciipan43_stdout, mode=mode),
-            default_peptide_lengths=default_peptide_lengths,
-            extra_flags=['-BA'] + extra_flags)
 
 class NetMHCIIpan43_EL(NetMHCIIpan43):
     """
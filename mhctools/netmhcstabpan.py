@@ -38,8 +38,16 @@ class NetMHCstabpan(BaseCommandlinePredictor):
             process_limit=process_limit)
         
     def predict_peptides(self, peptides):
-        peptide_lengths = set(len(p) for p in peptides)
-        if len(peptide_lengths) > 1:
-            raise ValueError("All peptides must be the same length")
+        # stop at the first peptide with a different length instead of
+        # collecting the lengths of all peptides, without indexing so that
+        # any iterable of peptides is accepted
+        peptide_iter = iter(peptides)
+        try:
+            peptide_length = len(next(peptide_iter))
+        except StopIteration:
+            pass
+        else:
+            if any(len(p) != peptide_length for p in peptide_iter):
+                raise ValueError("All peptides must be the same length")
         return super().predict_peptides(peptides)
     
@@ -12,14 +12,13 @@
 
 from __future__ import print_function, division, absolute_import
 
-import numpy as np
-
-from mhcnames import normalize_allele_name
+from math import isfinite
 
 from .binding_prediction import BindingPrediction
+from .common import cached_normalize_allele_name
 
-
-NETMHC_TOKENS = {
+# tuple rather than set so it can be passed straight to str.startswith
+NETMHC_TOKENS = (
     "pos",
     "Pos",
     "Seq",
@@ -28,17 +27,48 @@ NETMHC_TOKENS = {
     "Allele",
     "NetMHC",
     "Strong",
+)
+
+# prefixes of every line which split_stdout_lines skips after the first
+# dashed line: separators, comments and headers
+SKIPPED_LINE_PREFIXES = ("---", "#") + NETMHC_TOKENS
+
+# the offset specified in "pos" (at index 0) is 1-based instead of 0-based
+# for several predictors. we adjust it to be 0-based, as in all the other
+# netmhc predictors supported by this library. Shared by the parsers rather
+# than rebuilt on every call.
+ONE_BASED_OFFSET_TRANSFORMS = {
+    0: lambda x: int(x) - 1,
 }
 
+# NetMHC 3.x only fills in the "Bind Level" column for binders
+NETMHC3_IGNORED_VALUE_INDICES = {"WB": 4, "SB": 4}
+
 def check_stdout_error(stdout, program_name):
-    if "ERROR" in stdout.upper():
+    # upper-case the (possibly large) output once and search it a single time
+    error_index = stdout.upper().find("ERROR")
+    if error_index != -1:
         # if NetMHC* failed with an error then let's pull out the error
         # message line and raise an exception with it
-        error_index = stdout.upper().index("ERROR")
-        stdout_after_error = stdout[error_index:]
-        error_line = stdout_after_error.split("\n")[0]
+        end_of_line_index = stdout.find("\n", error_index)
+        if end_of_line_index == -1:
+            end_of_line_index = len(stdout)
+        error_line = stdout[error_index:end_of_line_index]
         raise ValueError("%s failed - %s" % (program_name, error_line))
 
+def find_first_dash_line(stdout):
+    """
+    Returns the index of the start of the first line in stdout which begins
+    with '---' (ignoring leading whitespace) or -1 if there isn't one.
+    """
+    dash_index = stdout.find("---")
+    while dash_index != -1:
+        line_start = stdout.rfind("\n", 0, dash_index) + 1
+        if not stdout[line_start:dash_index].strip():
+            return line_start
+        dash_index = stdout.find("---", dash_index + 3)
+    return -1
+
 def split_stdout_lines(stdout):
     """
     Given the standard output from NetMHC/NetMHCpan/NetMHCcons tools,
@@ -46,23 +76,24 @@ def split_stdout_lines(stdout):
     remaining lines by whitespace.
     """
     # all the NetMHC formats use lines full of dashes before any actual
-    # binding results
-    seen_dash = False
-    for l in stdout.split("\n"):
-        l = l.strip()
-        # wait for a line like '----------' before trying to parse entries
-        # have to include multiple dashes here since NetMHC 4.0 sometimes
-        # gives negative positions in its "peptide" input mode
-        if l.startswith("---"):
-            seen_dash = True
-            continue
-        if not seen_dash:
-            continue
-        # ignore empty lines and comments
-        if not l or l.startswith("#"):
+    # binding results, so jump straight to the first one instead of
+    # looking at every line of the preamble
+    # (have to include multiple dashes here since NetMHC 4.0 sometimes
+    # gives negative positions in its "peptide" input mode)
+    first_dash_index = find_first_dash_line(stdout)
+    if first_dash_index == -1:
+        return
+    for l in stdout[first_dash_index:].splitlines():
+        # ignore empty lines, and only strip leading whitespace off indented
+        # lines (trailing whitespace doesn't matter to str.split)
+        if not l:
             continue
-        # beginning of headers in NetMHC
-        if any(l.startswith(word) for word in NETMHC_TOKENS):
+        if l[0].isspace():
+            l = l.lstrip()
+            if not l:
+                continue
+        # ignore lines of dashes, comments and the beginning of headers
+        if l.startswith(SKIPPED_LINE_PREFIXES):
             continue
         yield l.split()
 
@@ -84,18 +115,26 @@ def clean_fields(fields, ignored_value_indices, transforms):
     have 0-based offsets (and we rely on 0-based offsets). We handle this using
     a map from field index to transform function.
     """
-    cleaned_fields = []
-    for i, field in enumerate(fields):
-        if field in ignored_value_indices:
-            ignored_index = ignored_value_indices[field]
-
-            # Is the value we want to ignore at the index where we'd ignore it?
-            if ignored_index == i:
-                continue
-
-        # transform this field if the index is in transforms, otherwise leave alone
-        cleaned_field = transforms[i](field) if i in transforms else field
-        cleaned_fields.append(cleaned_field)
+    # only look at the (few) positions where values get ignored instead of
+    # checking every field of the row
+    dropped_indices = {
+        i
+        for (value, i) in ignored_value_indices.items()
+        if i < len(fields) and fields[i] == value
+    }
+    if dropped_indices:
+        # transforms refer to the original positions of the fields
+        return [
+            transforms[i](field) if i in transforms else field
+            for (i, field) in enumerate(fields)
+            if i not in dropped_indices
+        ]
+    if not transforms:
+        return fields
+    cleaned_fields = list(fields)
+    for i, transform in transforms.items():
+        if i < len(cleaned_fields):
+            cleaned_fields[i] = transform(cleaned_fields[i])
     return cleaned_fields
 
 def valid_affinity(x):
@@ -112,9 +151,7 @@ def valid_affinity(x):
     """
     if x is None:
         return False
-    if np.isnan(x) or np.isinf(x):
-        return False
-    return x >= 0
+    return isfinite(x) and x >= 0
 
 def parse_stdout(
         stdout,
@@ -128,8 +165,8 @@ def parse_stdout(
         rank_index=None,
         ic50_index=None,
 
-        ignored_value_indices={},
-        transforms={}):
+        ignored_value_indices=None,
+        transforms=None):
     """
     Generic function for parsing any NetMHC* output, given expected indices
     of values of interest.
@@ -159,63 +196,118 @@ def parse_stdout(
         to the sequence names which should be used in the parsed
         BindingPrediction objects
 
-    ignored_value_indices : dict
+    ignored_value_indices : dict, optional
         Map from values to the positions we'll ignore them at.
         See clean_fields.
 
-    transforms  : dict
+    transforms  : dict, optional
         Map from field index to a transform function to be applied to values in
         that field. See clean_fields.
 
     Returns BindingPredictionCollection
     """
+    if ignored_value_indices is None:
+        ignored_value_indices = {}
+    if transforms is None:
+        transforms = {}
+
+    # positions (and values) to check for ignored values; rows which have
+    # one get rebuilt by clean_fields since everything after it shifts
+    ignored_checks = [
+        (i, value) for (value, i) in ignored_value_indices.items()
+    ]
+
+    # rows without a dropped value are indexed directly, and only the
+    # transforms of the columns we actually extract need to be applied
+    extracted_indices = {
+        key_index,
+        offset_index,
+        peptide_index,
+        allele_index,
+        score_index,
+        rank_index,
+        ic50_index,
+    }
+    column_transforms = [
+        (i, transform)
+        for (i, transform) in transforms.items()
+        if i in extracted_indices
+    ]
+
+    if sequence_key_mapping:
+        lookup_key = sequence_key_mapping.__getitem__
+    else:
+        # if sequence_key_mapping isn't provided then let's assume it's the
+        # identity function
+        lookup_key = None
+
+    # look up module-level names once rather than on every row
+    binding_prediction_class = BindingPrediction
+    normalize_allele = cached_normalize_allele_name
+    has_score = score_index is not None
+    has_rank = rank_index is not None
+    has_ic50 = ic50_index is not None
+
+    # outputs usually contain a single allele (or long runs of the same one),
+    # so only normalize the allele name when it changes between rows
+    previous_allele = None
+    normalized_allele = None
+
+    # similarly, consecutive rows mostly come from the same sequence, so
+    # reuse a single key string for all of them instead of keeping a separate
+    # copy from every split line
+    previous_key = None
+    original_key = None
 
     binding_predictions = []
+    append_prediction = binding_predictions.append
     for fields in split_stdout_lines(stdout):
-        fields = clean_fields(fields, ignored_value_indices, transforms)
-
-        offset = int(fields[offset_index])
-        peptide = str(fields[peptide_index])
-        allele = str(fields[allele_index])
-
-        if score_index is None:
-            score = None
+        for i, value in ignored_checks:
+            if i < len(fields) and fields[i] == value:
+                fields = clean_fields(
+                    fields, ignored_value_indices, transforms)
+                break
         else:
-            score = float(fields[score_index])
+            for i, transform in column_transforms:
+                fields[i] = transform(fields[i])
 
-        if rank_index is None:
-            rank = None
-        else:
-            rank = float(fields[rank_index])
+        offset = int(fields[offset_index])
+        peptide = fields[peptide_index]
+        allele = fields[allele_index]
 
-        if ic50_index is None:
-            ic50 = None
-        else:
-            ic50 = float(fields[ic50_index])
+        score = float(fields[score_index]) if has_score else None
+        rank = float(fields[rank_index]) if has_rank else None
+        ic50 = float(fields[ic50_index]) if has_ic50 else None
 
-        key = str(fields[key_index])
-        if sequence_key_mapping:
-            original_key = sequence_key_mapping[key]
-        else:
-            # if sequence_key_mapping isn't provided then let's assume it's the
-            # identity function
-            original_key = key
+        key = fields[key_index]
+        if key != previous_key:
+            previous_key = key
+            original_key = key if lookup_key is None else lookup_key(key)
 
         # if we have a bad IC50 score we might still get a salvageable
         # log of the score. Strangely, this is necessary sometimes!
-        if ic50_index is not None and (not valid_affinity(ic50)) and np.isfinite(score):
+        if has_ic50 and (not valid_affinity(ic50)) and isfinite(score):
             # pylint: disable=invalid-unary-operand-type
-            ic50 = 50000 ** (1 - score)
-
-        binding_predictions.append(BindingPrediction(
-            source_sequence_name=original_key,
-            offset=offset,
-            peptide=peptide,
-            allele=normalize_allele_name(allele),
-            score=score,
-            affinity=ic50,
-            percentile_rank=rank,
-            prediction_method_name=prediction_method_name))
+            # (float operands go straight to the C pow instead of
+            # converting the int base first)
+            ic50 = 50000.0 ** (1.0 - score)
+
+        if allele != previous_allele:
+            previous_allele = allele
+            normalized_allele = normalize_allele(allele)
+
+        # positional arguments in the order of BindingPrediction.__init__:
+        # peptide, allele, score, percentile_rank, affinity,
+        # source_sequence_name, offset, prediction_method_name
+        append_prediction(binding_prediction_class(
+            peptide,
+            normalized_allele,
+            score,
+            rank,
+            ic50,
+            original_key,
+            offset,
+            prediction_method_name))
     return binding_predictions
 
 def parse_netmhc3_stdout(
@@ -247,7 +339,7 @@ def parse_netmhc3_stdout(
         score_index=2,
         ic50_index=3,
         rank_index=None,
-        ignored_value_indices={"WB": 4, "SB": 4})
+        ignored_value_indices=NETMHC3_IGNORED_VALUE_INDICES)
 
 def parse_netmhc4_stdout(
         stdout,
@@ -372,12 +464,6 @@ def parse_netmhcpan3_stdout(
     1  HLA-B*18:01        MFCQLAKT  MFCQLAKT-  0  0  0  8  1     MFCQLAKT     sequence0_0 0.02864 36676.0   45.00
     2  HLA-B*18:01        FCQLAKTY  F-CQLAKTY  0  0  0  1  1     FCQLAKTY     sequence0_0 0.07993 21056.5   13.00
     """
-
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
     return parse_stdout(
         stdout=stdout,
         prediction_method_name=prediction_method_name,
@@ -389,7 +475,7 @@ def parse_netmhcpan3_stdout(
         ic50_index=12,
         rank_index=13,
         score_index=11,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
 
 
 def parse_netmhcpan4_stdout(
@@ -417,12 +503,6 @@ def parse_netmhcpan4_stdout(
 
     Protein PEPLIST. Allele HLA-A*02:01. Number of high binders 0. Number of weak binders 0. Number of peptides 1
     """
-
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
     return parse_stdout(
         stdout=stdout,
         prediction_method_name=prediction_method_name,
@@ -434,7 +514,7 @@ def parse_netmhcpan4_stdout(
         score_index=11,
         ic50_index=None if mode == "elution_score" else 12,
         rank_index=12 if mode == "elution_score" else 13,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
 
 def parse_netmhcpan41_stdout(
         stdout,
@@ -455,12 +535,6 @@ def parse_netmhcpan41_stdout(
 
 	-----------------------------------------------------------------------------------
     """
-
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
     return parse_stdout(
         stdout=stdout,
         prediction_method_name=prediction_method_name,
@@ -472,7 +546,7 @@ def parse_netmhcpan41_stdout(
         score_index=11 if mode == "elution_score" else 13,
         ic50_index=None if mode == "elution_score" else 15,
         rank_index=12 if mode == "elution_score" else 14,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
 
 
 def parse_netmhccons_stdout(
@@ -580,12 +654,6 @@ def parse_netmhciipan4_stdout(
     if mode not in ["elution_score", "binding_affinity"]:
         raise ValueError("Mode is %s but must be one of: elution_score, binding affinity" % mode)
 
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
-
     # we're running NetMHCIIpan 4 with -BA every time so both EL and BA are available, but only
     # return one of them depending on the input mode
     return parse_stdout(
@@ -599,7 +667,7 @@ def parse_netmhciipan4_stdout(
         ic50_index=11 if mode == "binding_affinity" else None,
         rank_index=8 if mode == "elution_score" else 12,
         score_index=7 if mode == "elution_score" else 10,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
 
 def parse_netmhcstabpan(
         stdout,
@@ -625,12 +693,6 @@ def parse_netmhcstabpan(
 
     -----------------------------------------------------------------------------------------------------
     """
-
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
     return parse_stdout(
         stdout=stdout,
         prediction_method_name=prediction_method_name,
@@ -641,7 +703,7 @@ def parse_netmhcstabpan(
         allele_index=1,
         score_index=5,
         rank_index=6,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
 
 def parse_netmhciipan43_stdout(
         stdout,
@@ -673,12 +735,6 @@ def parse_netmhciipan43_stdout(
     if mode not in ["elution_score", "binding_affinity"]:
         raise ValueError("Mode is %s but must be one of: elution_score, binding affinity" % mode)
 
-    # the offset specified in "pos" (at index 0) is 1-based instead of 0-based. we adjust it to be
-    # 0-based, as in all the other netmhc predictors supported by this library.
-    transforms = {
-        0: lambda x: int(x) - 1,
-    }
-
     # we're running NetMHCIIpan 4.3 with -BA every time so both EL and BA are available, but only
     # return one of them depending on the input mode
     return parse_stdout(
@@ -692,4 +748,4 @@ def parse_netmhciipan43_stdout(
         ic50_index=13 if mode == "binding_affinity" else None,
         rank_index=9 if mode == "elution_score" else 12,
         score_index=8 if mode == "elution_score" else 11,
-        transforms=transforms)
+        transforms=ONE_BASED_OFFSET_TRANSFORMS)
@@ -11,42 +11,59 @@
 # limitations under the License.
 
 from __future__ import print_function, division, absolute_import
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import os
-from subprocess import Popen, CalledProcessError
+from threading import Lock
+from subprocess import Popen, PIPE, CalledProcessError
 import time
 from multiprocessing import cpu_count
 
-# pylint: disable=import-error
-from queue import Queue
-
 logger = logging.getLogger(__name__)
 
+# the command log message of run_multiple_commands_redirect_stdout is
+# written to each output file by temporarily attaching a handler to the
+# shared logger, so only let one worker thread do that at a time
+_redirect_log_lock = Lock()
+
 class AsyncProcess(object):
     """
     A thin wrapper around Popen which starts a process asynchronously,
     suppresses stdout printing, and raises an exception if the return code
-    of wait() isn't 0
+    of wait() isn't 0. If capture_stdout is set then the process writes to a
+    pipe and its output is available as the `stdout` attribute after wait().
     """
     def __init__(
             self,
             args,
             suppress_stderr=False,
-            redirect_stdout_file=None):
+            redirect_stdout_file=None,
+            capture_stdout=False):
         assert len(args) > 0
+        assert not (capture_stdout and redirect_stdout_file), \
+            "Can't both capture and redirect stdout"
         self.cmd = args[0]
         self.args = args
         self.suppress_stderr = suppress_stderr
         self.redirect_stdout_file = redirect_stdout_file
+        self.capture_stdout = capture_stdout
+        self.stdout = None
         self.process = None
 
     def start(self):
         with open(os.devnull, 'w') as devnull:
-            stdout = (
-                self.redirect_stdout_file if self.redirect_stdout_file
-                else devnull)
+            if self.capture_stdout:
+                stdout = PIPE
+            elif self.redirect_stdout_file:
+                stdout = self.redirect_stdout_file
+            else:
+                stdout = devnull
             stderr = devnull if self.suppress_stderr else None
-            self.process = Popen(self.args, stdout=stdout, stderr=stderr)
+            self.process = Popen(
+                self.args,
+                stdout=stdout,
+                stderr=stderr,
+                universal_newlines=self.capture_stdout)
 
     def poll(self):
         """
@@ -60,7 +77,13 @@ class AsyncProcess(object):
     def wait(self):
         if self.process is None:
             self.start()
-        ret_code = self.process.wait()
+        if self.capture_stdout:
+            # communicate() keeps draining the pipe so that the process
+            # can't block on a full pipe buffer
+            self.stdout, _ = self.process.communicate()
+            ret_code = self.process.returncode
+        else:
+            ret_code = self.process.wait()
         logger.debug(
             "%s finished with return code %s",
             self.cmd,
@@ -106,59 +129,131 @@ def run_multiple_commands_redirect_stdout(
         if there is no limit, -1 to use max number of processors
 
     polling_freq : int
-        Number of seconds between checking for done processes, if
-        we have a process limit
+        Unused, kept for backwards compatibility. Finished processes are
+        now noticed as soon as they exit instead of by polling.
     """
     assert len(multiple_args_dict) > 0
     assert all(len(args) > 0 for args in multiple_args_dict.values())
     assert all(hasattr(f, 'name') for f in multiple_args_dict.keys())
     if process_limit < 0:
-        logger.debug("Using %d processes" % cpu_count())
+        logger.debug("Using %d processes", cpu_count())
         process_limit = cpu_count()
+    elif process_limit == 0:
+        process_limit = len(multiple_args_dict)
 
     start_time = time.time()
-    processes = Queue(maxsize=process_limit)
 
-    def add_to_queue(process):
+    def run_and_redirect(f, args):
+        process = AsyncProcess(
+            args,
+            redirect_stdout_file=f,
+            **kwargs)
         process.start()
-        if print_commands:
-            handler = logging.FileHandler(process.redirect_stdout_file.name)
-            handler.setLevel(logging.DEBUG)
-            logger.addHandler(handler)
-            logger.debug(" ".join(process.args))
-            logger.removeHandler(handler)
-        processes.put(process)
-
-    for f, args in multiple_args_dict.items():
-        p = AsyncProcess(
-                args,
-                redirect_stdout_file=f,
-                **kwargs)
-        if not processes.full():
-            add_to_queue(p)
-        else:
-            while processes.full():
-                # Are there any done processes?
-                to_remove = []
-                for possibly_done in processes.queue:
-                    if possibly_done.poll() is not None:
-                        possibly_done.wait()
-                        to_remove.append(possibly_done)
-                # Remove them from the queue and stop checking
-                if to_remove:
-                    for process_to_remove in to_remove:
-                        processes.queue.remove(process_to_remove)
-                    break
-                # Check again in a second if there weren't
-                time.sleep(polling_freq)
-            add_to_queue(p)
-
-    # Wait for all the rest of the processes
-    while not processes.empty():
-        processes.get().wait()
+        # only open a log handler on the output file if the debug message
+        # is actually going to be written
+        if print_commands and logger.isEnabledFor(logging.DEBUG):
+            with _redirect_log_lock:
+                handler = logging.FileHandler(f.name)
+                handler.setLevel(logging.DEBUG)
+                logger.addHandler(handler)
+                logger.debug(" ".join(args))
+                logger.removeHandler(handler)
+                handler.close()
+        process.wait()
+
+    # instead of periodically polling every running process, each worker
+    # thread blocks on its own subprocess so the next command starts as
+    # soon as any of them finishes
+    with ThreadPoolExecutor(max_workers=process_limit) as executor:
+        futures = [
+            executor.submit(run_and_redirect, f, args)
+            for (f, args) in multiple_args_dict.items()
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            # don't start any more commands if one of them failed
+            for future in futures:
+                future.cancel()
 
     elapsed_time = time.time() - start_time
     logger.info(
         "Ran %d commands in %0.4f seconds",
         len(multiple_args_dict),
         elapsed_time)
+
+def iter_multiple_commands_capture_stdout(
+        multiple_args,
+        print_commands=True,
+        process_limit=-1,
+        **kwargs):
+    """
+    Run multiple shell commands in parallel and collect the stdout of each
+    one directly from a pipe, without writing it to disk. Outputs are
+    generated as soon as each command finishes, so that callers can
+    process them while slower commands are still running.
+
+    Parameters
+    ----------
+    multiple_args : list of list of str
+        Each element is an args list to run as a subprocess.
+
+    print_commands : bool
+        Print shell commands before running them.
+
+    process_limit : int
+        Limit the number of concurrent processes to this number. 0
+        if there is no limit, -1 to use max number of processors
+
+    Generates (index, stdout) pairs in order of completion, where index is
+    the position of the command in multiple_args.
+    """
+    assert len(multiple_args) > 0
+    assert all(len(args) > 0 for args in multiple_args)
+    if process_limit < 0:
+        logger.debug("Using %d processes", cpu_count())
+        process_limit = cpu_count()
+    elif process_limit == 0:
+        process_limit = len(multiple_args)
+
+    start_time = time.time()
+
+    # the first failure is recorded by the worker thread itself, so that no
+    # worker starts another command after it even if the generator hasn't
+    # gotten around to cancelling the remaining ones yet
+    failures = []
+
+    def run_and_capture(args):
+        if failures:
+            raise failures[0]
+        if print_commands and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running %s", " ".join(args))
+        process = AsyncProcess(args, capture_stdout=True, **kwargs)
+        try:
+            process.wait()
+        except CalledProcessError as e:
+            failures.append(e)
+            raise
+        return process.stdout
+
+    # each worker thread just blocks on its own subprocess, so the
+    # number of threads bounds the number of concurrent processes
+    with ThreadPoolExecutor(max_workers=process_limit) as executor:
+        futures = {
+            executor.submit(run_and_capture, args): i
+            for (i, args) in enumerate(multiple_args)
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # don't start any more commands if one of them failed
+            for future in futures:
+                future.cancel()
+
+    elapsed_time = time.time() - start_time
+    logger.info(
+        "Ran %d commands in %0.4f seconds",
+        len(multiple_args),
+        elapsed_time)
@@ -10,7 +10,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import random
+from itertools import product
+
+import numpy as np
 
 from .base_predictor import BasePredictor
 from .binding_prediction import BindingPrediction
@@ -27,14 +29,23 @@ class RandomBindingPredictor(BasePredictor):
             default_peptide_lengths=default_peptide_lengths)
 
     def predict_peptides(self, peptides):
+        # draw all the random values for every (peptide, allele) pair in a
+        # few bulk NumPy calls rather than one Python call per value
+        n_predictions = len(peptides) * len(self.alleles)
+        scores = np.random.random(n_predictions).tolist()
+        affinities = (np.random.random(n_predictions) * 10000.0).tolist()
+        percentile_ranks = np.random.randint(0, 100, n_predictions).tolist()
         return BindingPredictionCollection([
             BindingPrediction(
                 allele=allele,
                 peptide=p,
-                score=random.random(),
-                affinity=random.random() * 10000.0,
-                percentile_rank=random.randint(0, 99),
+                score=score,
+                affinity=affinity,
+                percentile_rank=percentile_rank,
                 prediction_method_name="random")
-            for p in peptides
-            for allele in self.alleles
+            for ((p, allele), score, affinity, percentile_rank) in zip(
+                product(peptides, self.alleles),
+                scores,
+                affinities,
+                percentile_ranks)
         ])
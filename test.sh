@@ -1 +1 @@
-pytest --cov=mhctools/ --cov-report=term-missing tests
+pytest --cov=mhctools/ --cov-report=term-missing tests "$@"
@@ -0,0 +1,94 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from multiprocessing import cpu_count
+
+from mhctools.base_commandline_predictor import BaseCommandlinePredictor
+from .common import eq_
+
+ONE_ALLELE = ["HLA-A*02:01"]
+THREE_ALLELES = ["HLA-A*02:01", "HLA-A*02:03", "HLA-B*07:02"]
+TEN_ALLELES = ["HLA-A*02:%02d" % i for i in range(1, 11)]
+
+
+def make_predictor(alleles, **kwargs):
+    # "true" stands in for the external program, the file chunking doesn't
+    # depend on which predictor gets run
+    return BaseCommandlinePredictor(
+        program_name="true",
+        alleles=alleles,
+        parse_output_fn=None,
+        supported_alleles_flag=None,
+        input_file_flag="-f",
+        length_flag="-l",
+        allele_flag="-a",
+        **kwargs)
+
+
+def test_peptides_per_file_single_process():
+    predictor = make_predictor(ONE_ALLELE, process_limit=1)
+    eq_(predictor._peptides_per_file(5000), 5000)
+
+
+def test_peptides_per_file_split_across_processes():
+    # one allele, so split the peptides into one file per process
+    predictor = make_predictor(ONE_ALLELE, process_limit=4)
+    eq_(predictor._peptides_per_file(8000), 2000)
+    # uneven splits round up so there are never more files than processes
+    eq_(predictor._peptides_per_file(8001), 2001)
+
+
+def test_peptides_per_file_multiple_alleles():
+    # each file gets one command per allele, so 4 processes and 3 alleles
+    # only need 2 files
+    predictor = make_predictor(THREE_ALLELES, process_limit=4)
+    eq_(predictor._peptides_per_file(8000), 4000)
+    # as many alleles as processes: a single file keeps them all busy
+    predictor = make_predictor(THREE_ALLELES, process_limit=3)
+    eq_(predictor._peptides_per_file(8000), 8000)
+    # more alleles than processes
+    predictor = make_predictor(TEN_ALLELES, process_limit=4)
+    eq_(predictor._peptides_per_file(8000), 8000)
+
+
+def test_peptides_per_file_default_process_limit():
+    # both -1 (the default) and 0 use one process per CPU
+    n_peptides = 2000 * cpu_count()
+    for process_limit in [-1, 0]:
+        predictor = make_predictor(ONE_ALLELE, process_limit=process_limit)
+        eq_(predictor._peptides_per_file(n_peptides), 2000)
+
+
+def test_peptides_per_file_min_and_max():
+    predictor = make_predictor(ONE_ALLELE, process_limit=4)
+    # small inputs don't get split into tiny files
+    eq_(predictor._peptides_per_file(10), 1000)
+    # large inputs are still capped at max_peptides_per_file
+    eq_(predictor._peptides_per_file(10 ** 6), 10 ** 4)
+
+
+def test_peptides_per_file_max_below_min():
+    # max_peptides_per_file wins when it's below min_peptides_per_file
+    predictor = make_predictor(
+        ONE_ALLELE,
+        process_limit=4,
+        max_peptides_per_file=500,
+        min_peptides_per_file=1000)
+    eq_(predictor._peptides_per_file(10), 500)
+    eq_(predictor._peptides_per_file(8000), 500)
+
+
+def test_build_command_uses_prepared_allele_name():
+    predictor = make_predictor(ONE_ALLELE, process_limit=1)
+    allele = predictor.alleles[0]
+    eq_(predictor._build_command("peptides.txt", allele),
+        ["true", "-a", "HLA-A02:01", "-f", "peptides.txt"])
@@ -25,3 +25,8 @@ def test_collection_to_dataframe():
     eq_(df.affinity.iloc[0], 1.5)
     eq_(df.allele.iloc[0], "A0201")
     eq_(df.percentile_rank.iloc[0], 0.1)
+
+def test_empty_collection_to_dataframe():
+    df = BindingPredictionCollection([]).to_dataframe()
+    eq_(len(df), 0)
+    eq_(list(df.columns), list(BindingPrediction.fields) + ["length"])
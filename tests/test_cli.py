@@ -10,9 +10,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import tempfile
-from os import remove
-
 from mhctools.cli.script import parse_args, run_predictor
 from .common import eq_
 
@@ -40,35 +37,33 @@ def test_peptides_with_subsequences():
     eq_(binding_predictions[0].peptide, peptide[:9])
     eq_(binding_predictions[1].peptide, peptide[1:10])
 
-def test_peptides_file_without_subsequences():
+def test_peptides_file_without_subsequences(tmp_path):
     peptide = "SIINFEKLQY"
-    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-        f.write("%s\n" % peptide)
+    peptides_file = tmp_path / "peptides.txt"
+    peptides_file.write_text("%s\n" % peptide)
 
     args = parse_args([
         "--mhc-predictor", "netmhc",
         "--mhc-peptide-lengths", "9",
-        "--input-peptides-file", f.name,
+        "--input-peptides-file", str(peptides_file),
         "--mhc-alleles", "H-2-Kb"])
     binding_predictions = run_predictor(args)
     eq_(len(binding_predictions), 1, binding_predictions)
     eq_(binding_predictions[0].peptide, peptide)
-    remove(f.name)
 
-def test_peptides_file_with_subsequences():
+def test_peptides_file_with_subsequences(tmp_path):
     peptide = "SIINFEKLQY"
-    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-        f.write("%s\n" % peptide)
+    peptides_file = tmp_path / "peptides.txt"
+    peptides_file.write_text("%s\n" % peptide)
 
     args = parse_args([
         "--mhc-predictor", "netmhc",
         "--mhc-peptide-lengths", "9",
-        "--input-peptides-file", f.name,
+        "--input-peptides-file", str(peptides_file),
         "--extract-subsequences",
         "--mhc-alleles", "H-2-Kb"])
     binding_predictions = sorted(run_predictor(args), key=lambda bp: bp.offset)
     eq_(len(binding_predictions), 2, binding_predictions)
     eq_(binding_predictions[0].peptide, peptide[:9])
     eq_(binding_predictions[1].peptide, peptide[1:10])
-    remove(f.name)
 
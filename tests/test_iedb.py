@@ -10,6 +10,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 import pytest
 from mhctools import IedbNetMHCpan
 from .common import assert_raises
@@ -18,12 +20,18 @@ from .common import assert_raises
 DEFAULT_ALLELE = 'HLA-A*02:01'
 UNSUPPORTED_ALLELE = 'HLA-A*24:01'
 
+# The IEDB web API has been returning 403 errors to CI runners, so these
+# tests only hit the network when explicitly requested.
+RUN_NETWORK_TESTS = os.environ.get("MHCTOOLS_RUN_NETWORK_TESTS") == "1"
+
 protein_sequence_dict = {
     "SMAD4-001": "ASIINFKELA",
     "TP53-001": "ASILLLVFYW"
 }
 
-@pytest.mark.xfail(reason="IEDB server giving 403 errors from GitHub actions runners")
+@pytest.mark.skipif(
+    not RUN_NETWORK_TESTS,
+    reason="network test; set MHCTOOLS_RUN_NETWORK_TESTS=1 to run")
 def test_netmhcpan_iedb():
     predictor = IedbNetMHCpan(alleles=[DEFAULT_ALLELE])
     binding_predictions = predictor.predict_subsequences(
@@ -38,7 +46,9 @@ def test_netmhcpan_iedb():
     assert len(binding_predictions) == 10, \
         "Expected 4 binding predictions from %s" % (binding_predictions,)
 
-@pytest.mark.xfail(reason="IEDB server giving 403 errors from GitHub actions runners")
+@pytest.mark.skipif(
+    not RUN_NETWORK_TESTS,
+    reason="network test; set MHCTOOLS_RUN_NETWORK_TESTS=1 to run")
 def test_netmhcpan_iedb_unsupported_allele():
     predictor = IedbNetMHCpan(alleles=[DEFAULT_ALLELE, UNSUPPORTED_ALLELE], raise_on_error=False)
     binding_predictions = predictor.predict_subsequences(
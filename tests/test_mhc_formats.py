@@ -11,11 +11,14 @@
 # limitations under the License.
 
 from mhctools.parsing import (
+  clean_fields,
+  parse_stdout,
   parse_netmhcpan28_stdout,
   parse_netmhcpan3_stdout,
   parse_netmhc3_stdout,
   parse_netmhc4_stdout,
 )
+from .common import eq_
 
 def test_netmhc3_stdout():
     """
@@ -116,6 +119,8 @@ Protein PEPLIST. Allele HLA-A0202. Number of high binders 0. Number of weak bind
         # make sure both allele's tables get parsed
         assert entry.allele in ('HLA-A*02:01', 'HLA-A*02:02'), entry
         assert 0 < entry.value < 50000, entry
+        assert isinstance(entry.peptide, str), entry
+        assert isinstance(entry.source_sequence_name, str), entry
         # expect the epitope AEFGPWQTV to have high affinity for both
         # alleles
         if entry.peptide == "AEFGPWQTV":
@@ -185,3 +190,63 @@ def test_mhcpan3_stdout():
             # expect the epitopes to be sorted in increasing IC50
             assert entry.value == 18234.7, entry
             assert entry.percentile_rank == 10.00, entry
+
+def test_clean_fields_unchanged():
+    fields = ["0", "SIINFEKL", "seq0"]
+    eq_(clean_fields(fields, {}, {}), ["0", "SIINFEKL", "seq0"])
+    # ignored values only get dropped at their own position
+    eq_(clean_fields(fields, {"seq0": 1}, {}), ["0", "SIINFEKL", "seq0"])
+
+def test_clean_fields_ignored_values():
+    ignored_value_indices = {"WB": 4, "SB": 4}
+    eq_(clean_fields(
+            ["0", "SLYNTVATL", "0.579", "94", "WB", "seq5", "HLA-A02:01"],
+            ignored_value_indices,
+            {}),
+        ["0", "SLYNTVATL", "0.579", "94", "seq5", "HLA-A02:01"])
+    eq_(clean_fields(
+            ["0", "SLYNTVATL", "0.730", "18", "SB", "seq5", "HLA-A02:03"],
+            ignored_value_indices,
+            {}),
+        ["0", "SLYNTVATL", "0.730", "18", "seq5", "HLA-A02:03"])
+    eq_(clean_fields(
+            ["0", "CFTWNQMNL", "0.085", "19899", "seq4", "HLA-A02:01"],
+            ignored_value_indices,
+            {}),
+        ["0", "CFTWNQMNL", "0.085", "19899", "seq4", "HLA-A02:01"])
+
+def test_clean_fields_transforms():
+    transforms = {0: lambda x: int(x) - 1, 5: str.lower}
+    # transforms past the end of a short row are skipped
+    eq_(clean_fields(["3", "SIINFEKL", "seq0"], {}, transforms),
+        [2, "SIINFEKL", "seq0"])
+
+def test_clean_fields_ignored_values_and_transforms():
+    # transforms refer to the positions before any values were dropped
+    eq_(clean_fields(
+            ["1", "x", "WB", "seq0"],
+            {"WB": 2},
+            {0: lambda x: int(x) - 1, 3: str.upper}),
+        [0, "x", "SEQ0"])
+
+def test_parse_stdout_ignored_values_and_transforms():
+    stdout = """
+    ---------------------------------------------
+    1  SIINFEKL  WB  0.5  seq0  HLA-A02:01
+    2  SIINFEKY      0.1  seq0  HLA-A02:01
+    """
+    binding_predictions = parse_stdout(
+        stdout=stdout,
+        prediction_method_name="test",
+        sequence_key_mapping=None,
+        key_index=3,
+        offset_index=0,
+        peptide_index=1,
+        allele_index=4,
+        score_index=2,
+        ignored_value_indices={"WB": 2},
+        transforms={0: lambda x: int(x) - 1})
+    eq_([bp.offset for bp in binding_predictions], [0, 1])
+    eq_([bp.peptide for bp in binding_predictions], ["SIINFEKL", "SIINFEKY"])
+    eq_([bp.score for bp in binding_predictions], [0.5, 0.1])
+    eq_([bp.allele for bp in binding_predictions], ["HLA-A*02:01"] * 2)
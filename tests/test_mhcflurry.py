@@ -15,7 +15,6 @@ import sys
 from .common  import eq_
 from numpy import testing
 
-from mhcflurry import Class1AffinityPredictor
 from mhctools import MHCflurry
 
 DEFAULT_ALLELE = "HLA-A*02:01"
@@ -27,8 +26,8 @@ protein_sequence_dict = {
 
 
 def test_mhcflurry():
-    predictor = MHCflurry(alleles=[DEFAULT_ALLELE])
-    binding_predictions = predictor.predict_subsequences(
+    mhcflurry_predictor = MHCflurry(alleles=[DEFAULT_ALLELE])
+    binding_predictions = mhcflurry_predictor.predict_subsequences(
         protein_sequence_dict,
         peptide_lengths=[9])
     eq_(4, len(binding_predictions),
@@ -38,10 +37,16 @@ def test_mhcflurry():
         (x.peptide, x.allele): x.affinity for x in binding_predictions
     }
 
-    predictor = Class1AffinityPredictor.load()
-    # test one prediction at a time to make sure there's no peptide/allele mixup
-    for (peptide, allele), affinity in prediction_scores.items():
-        prediction = predictor.predict([peptide], allele=allele)
-        assert len(prediction) == 1
+    # reuse the already loaded models instead of reading them from disk again
+    predictor = mhcflurry_predictor.predictor
+    # predict all the pairs in one batch but give each peptide its own allele
+    # to make sure there's no peptide/allele mixup
+    pairs = list(prediction_scores.keys())
+    predictions = predictor.predict(
+        [peptide for (peptide, _) in pairs],
+        alleles=[allele for (_, allele) in pairs])
+    eq_(len(pairs), len(predictions))
+    for (peptide, allele), prediction in zip(pairs, predictions):
         # we've seen results differ a bit so doing an approximate check, not an error condition
-        testing.assert_almost_equal(prediction[0], affinity, decimal=0)
+        testing.assert_almost_equal(
+            prediction, prediction_scores[(peptide, allele)], decimal=0)
@@ -34,9 +34,16 @@ def test_simple():
 
     # These numbers are from running http://tools.iedb.org/netchop
     # via the web interface on 12/19/2016.
-    testing.assert_almost_equal(result[0][95], 0.976629)
-    testing.assert_almost_equal(result[0][22], 0.022000)
-    testing.assert_almost_equal(result[1][146], 0.977417)
-    testing.assert_almost_equal(result[1][84], 0.285210)
-    testing.assert_almost_equal(result[2][0], 0.547588)
-    testing.assert_almost_equal(result[2][84], 0.104684)
+    testing.assert_array_almost_equal(
+        [
+            result[0][95],
+            result[0][22],
+            result[1][146],
+            result[1][84],
+            result[2][0],
+            result[2][84],
+        ],
+        [0.976629, 0.022000, 0.977417, 0.285210, 0.547588, 0.104684],
+        # same precision as assert_almost_equal, whose default is 7 rather
+        # than the 6 of assert_array_almost_equal
+        decimal=7)
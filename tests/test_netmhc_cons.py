@@ -11,6 +11,8 @@
 # limitations under the License.
 
 
+from collections import Counter
+
 import pytest 
 
 from mhctools import NetMHCcons
@@ -19,19 +21,21 @@ from mhcnames import normalize_allele_name
 from .arch import apple_silicon
 
 DEFAULT_ALLELE = 'HLA-A*02:01'
+NORMALIZED_DEFAULT_ALLELE = normalize_allele_name(DEFAULT_ALLELE)
+
+protein_sequence_dict = {
+    "SMAD4-001": "ASIINFKELA",
+    "TP53-001": "ASILLLVFYW"
+}
 
 @pytest.mark.skipif(apple_silicon, reason="Can't run netMHCcons on arm64 architecture")
 def test_netmhc_cons():
-    alleles = [normalize_allele_name(DEFAULT_ALLELE)]
+    alleles = [NORMALIZED_DEFAULT_ALLELE]
     cons_predictor = NetMHCcons(
         alleles=alleles,
         default_peptide_lengths=[9])
-    sequence_dict = {
-        "SMAD4-001": "ASIINFKELA",
-        "TP53-001": "ASILLLVFYW"
-    }
     binding_predictions = cons_predictor.predict_subsequences(
-        sequence_dict=sequence_dict)
+        sequence_dict=protein_sequence_dict)
 
     assert len(binding_predictions) == 4, \
         "Expected 4 epitopes from %s" % (binding_predictions,)
@@ -50,18 +54,14 @@ def test_netmhc_cons_multiple_alleles():
     cons_predictor = NetMHCcons(
         alleles=alleles,
         default_peptide_lengths=[9])
-    sequence_dict = {
-        "SMAD4-001": "ASIINFKELA",
-        "TP53-001": "ASILLLVFYW"
-    }
     binding_predictions = cons_predictor.predict_subsequences(
-        sequence_dict=sequence_dict)
+        sequence_dict=protein_sequence_dict)
     assert len(binding_predictions) == 8, \
         "Expected 4 binding predictions from %s" % (binding_predictions,)
 
 @pytest.mark.skipif(apple_silicon, reason="Can't run netMHCcons on arm64 architecture")
 def test_netmhc_cons_process_limits():
-    alleles = [normalize_allele_name(DEFAULT_ALLELE)]
+    alleles = [NORMALIZED_DEFAULT_ALLELE]
     sequence_dict = {
         "SMAD4-001": "ASIINFKELA",
         "TP53-001": "ASILLLVFYW",
@@ -84,9 +84,10 @@ def test_netmhc_cons_process_limits():
                 len(binding_predictions),
                 binding_predictions)
 
-        source_names = [bp.source_sequence_name for bp in binding_predictions]
+        source_name_counts = Counter(
+            bp.source_sequence_name for bp in binding_predictions)
         for fasta_key in sequence_dict.keys():
-            fasta_count = source_names.count(fasta_key)
+            fasta_count = source_name_counts[fasta_key]
             assert fasta_count == 2, \
                 ("Expected each fasta key to appear twice, once for "
                  "each length, but saw %s %d time(s)" % (
@@ -10,6 +10,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from shutil import which
+
+import pytest
+
 from .common import eq_
 
 from mhctools import NetMHCpan
@@ -36,8 +40,14 @@ OPTIONAL_NETMHCPAN_PROGRAM_NAMES = [
 def test_netmhc_pan():
     check_netmhc_pan("netMHCpan", True)  # required
 
-    for program_name in OPTIONAL_NETMHCPAN_PROGRAM_NAMES:
-        check_netmhc_pan(program_name, False)  # optional
+
+@pytest.mark.parametrize("program_name", OPTIONAL_NETMHCPAN_PROGRAM_NAMES)
+def test_optional_netmhc_pan(program_name):
+    # look for the program on the PATH before trying to run it, so missing
+    # versions are reported as skipped without launching a subprocess
+    if which(program_name) is None:
+        pytest.skip("No such program: %s" % program_name)
+    check_netmhc_pan(program_name, False)  # optional
 
 
 def check_netmhc_pan(program_name, fail_if_no_such_program=True):
@@ -79,11 +89,7 @@ def test_netmhc_pan_multiple_alleles():
     predictor = NetMHCpan(
         alleles=alleles,
         default_peptide_lengths=[9])
-    sequence_dict = {
-        "SMAD4-001": "ASIINFKELA",
-        "TP53-001": "ASILLLVFYW"
-    }
     binding_predictions = predictor.predict_subsequences(
-        sequence_dict=sequence_dict)
+        sequence_dict=protein_sequence_dict)
     assert len(binding_predictions) == 8, \
         "Expected 4 binding predictions from %s" % (binding_predictions,)
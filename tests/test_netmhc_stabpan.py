@@ -13,6 +13,8 @@
 from numpy.testing import assert_allclose
 from mhctools import NetMHCstabpan
 
+from .common import assert_raises
+
 
 DEFAULT_ALLELE = 'HLA-A*02:01'
 
@@ -49,13 +51,23 @@ def test_netmhc_stabpan_accuracy():
     assert len(web_server_predictions) == len(binding_predictions)
     assert len(stability_predictions) == len(binding_predictions)
 
-    for prank in rank_predictions:
-        # Make sure that correct mapping is done by checking percentiles aren't above 100.
-        assert prank < 100
-    
-    for i, (expected, actual) in enumerate(zip(web_server_predictions, stability_predictions)):
-        # Check to make sure that the stability predictions are within 0.01 of the webserver values.
-        # This could be the result of different versions of dependencies or the nature of the ANN itself.
-        assert_allclose(expected, actual, atol=0.01, err_msg="Peptide %d: expected %f but got %f" % (i, expected, actual))
+    # Make sure that correct mapping is done by checking percentiles aren't above 100.
+    assert max(rank_predictions) < 100, \
+        "Expected all percentile ranks < 100, got %s" % (rank_predictions,)
+
+    # Check to make sure that the stability predictions are within 0.01 of the webserver values.
+    # This could be the result of different versions of dependencies or the nature of the ANN itself.
+    # Comparing the whole arrays at once reports every mismatched peptide on failure.
+    assert_allclose(
+        stability_predictions,
+        web_server_predictions,
+        atol=0.01,
+        err_msg="Stability predictions differ from web server values")
+
 
-    
\ No newline at end of file
+def test_netmhc_stabpan_mixed_lengths():
+    predictor = NetMHCstabpan(
+        alleles=[DEFAULT_ALLELE], program_name='netMHCstabpan')
+    # a set isn't indexable, make sure it still reaches the length check
+    with assert_raises(ValueError):
+        predictor.predict_peptides({"SIINFEKL", "SIINFEKLL"})
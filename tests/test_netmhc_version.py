@@ -4,9 +4,10 @@ from mhcnames import normalize_allele_name
 from .common import raises, eq_
 from .arch import apple_silicon
 
+DEFAULT_ALLELE = normalize_allele_name("HLA-A*02:01")
 
 def run_class_with_executable(mhc_class, mhc_executable):
-    alleles = [normalize_allele_name("HLA-A*02:01")]
+    alleles = [DEFAULT_ALLELE]
     predictor = mhc_class(
         alleles=alleles,
         program_name=mhc_executable)
@@ -28,7 +29,7 @@ def test_executable_mismatch_4_3():
     run_class_with_executable(NetMHC4, "netMHC-3.4")
 
 def test_wrapper_function_netMHC4():
-    alleles = [normalize_allele_name("HLA-A*02:01")]
+    alleles = [DEFAULT_ALLELE]
     wrapped_4 = NetMHC(
         alleles=alleles,
         default_peptide_lengths=[9],
@@ -37,7 +38,7 @@ def test_wrapper_function_netMHC4():
 
 @pytest.mark.skipif(apple_silicon, reason="Can't run netMHC-3.4 on arm64 architecture")
 def test_wrapper_function_netMHC3():
-    alleles = [normalize_allele_name("HLA-A*02:01")]
+    alleles = [DEFAULT_ALLELE]
     wrapped_3 = NetMHC(
         alleles=alleles,
         default_peptide_lengths=[9],
@@ -46,7 +47,7 @@ def test_wrapper_function_netMHC3():
 
 @raises(SystemError, OSError, FileNotFoundError)
 def test_wrapper_failure():
-    alleles = [normalize_allele_name("HLA-A*02:01")]
+    alleles = [DEFAULT_ALLELE]
     NetMHC(alleles=alleles,
            default_peptide_lengths=[9],
            program_name="netMHC-none")
@@ -0,0 +1,132 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from os.path import exists
+from subprocess import CalledProcessError
+
+from mhctools.process_helpers import (
+    AsyncProcess,
+    iter_multiple_commands_capture_stdout,
+    run_multiple_commands_redirect_stdout,
+)
+from .common import eq_, assert_raises
+
+
+def sh(script):
+    return ["sh", "-c", script]
+
+
+def test_async_process_capture_stdout():
+    process = AsyncProcess(sh("echo hello"), capture_stdout=True)
+    eq_(process.wait(), 0)
+    eq_(process.stdout, "hello\n")
+
+
+def test_async_process_nonzero_exit():
+    process = AsyncProcess(sh("exit 3"), capture_stdout=True)
+    with assert_raises(CalledProcessError):
+        process.wait()
+
+
+def wait_for_file(path):
+    # block until the test creates path, giving up (and failing) after
+    # about 30 seconds rather than hanging the test suite
+    return (
+        "i=0; while [ ! -e %s ] && [ $i -lt 3000 ]; do "
+        "sleep 0.01; i=$((i + 1)); done; [ -e %s ]" % (path, path))
+
+
+def test_iter_capture_stdout_maps_outputs_to_command_index(tmp_path):
+    go = tmp_path / "go"
+    # the first command can't finish until the other two have, so the
+    # order of completion differs from the order of the commands
+    commands = [
+        sh("%s && echo first" % wait_for_file(go)),
+        sh("echo second"),
+        sh("echo third"),
+    ]
+    results = iter_multiple_commands_capture_stdout(commands, process_limit=3)
+    first_two = dict([next(results), next(results)])
+    eq_(first_two, {1: "second\n", 2: "third\n"})
+    go.touch()
+    eq_(list(results), [(0, "first\n")])
+
+
+def test_iter_capture_stdout_no_process_limit():
+    commands = [sh("echo %d" % i) for i in range(5)]
+    results = dict(iter_multiple_commands_capture_stdout(
+        commands, process_limit=0))
+    eq_(results, {i: "%d\n" % i for i in range(5)})
+
+
+def test_iter_capture_stdout_single_process():
+    commands = [sh("echo %d" % i) for i in range(3)]
+    results = list(iter_multiple_commands_capture_stdout(
+        commands, process_limit=1))
+    eq_(results, [(0, "0\n"), (1, "1\n"), (2, "2\n")])
+
+
+def test_iter_capture_stdout_failure_stops_remaining(tmp_path):
+    marker = tmp_path / "should_not_exist"
+    # with one process at a time the second command can only start after
+    # the first one has failed, so it must never be started
+    commands = [
+        sh("exit 1"),
+        sh("touch %s" % marker),
+    ]
+    with assert_raises(CalledProcessError):
+        list(iter_multiple_commands_capture_stdout(commands, process_limit=1))
+    assert not exists(str(marker)), \
+        "Expected commands after a failure not to be started"
+
+
+def run_redirected(tmp_path, commands, **kwargs):
+    output_paths = [tmp_path / ("out%d.txt" % i) for i in range(len(commands))]
+    output_files = [open(str(path), "w") for path in output_paths]
+    try:
+        # print_commands would also log each command into its output file
+        # when debug logging is enabled
+        run_multiple_commands_redirect_stdout(
+            dict(zip(output_files, commands)),
+            print_commands=False,
+            **kwargs)
+    finally:
+        for f in output_files:
+            f.close()
+    return [path.read_text() for path in output_paths]
+
+
+def test_redirect_stdout_writes_output_files(tmp_path):
+    commands = [sh("echo %d" % i) for i in range(4)]
+    outputs = run_redirected(tmp_path, commands, process_limit=2)
+    eq_(outputs, ["0\n", "1\n", "2\n", "3\n"])
+
+
+def test_redirect_stdout_failing_command(tmp_path):
+    commands = [sh("echo ok"), sh("exit 2")]
+    with assert_raises(CalledProcessError):
+        run_redirected(tmp_path, commands, process_limit=0)
+
+
+def test_redirect_stdout_process_limit(tmp_path):
+    running = tmp_path / "running"
+    running.mkdir()
+    # each command reports how many commands are running alongside it,
+    # which can never be more than the process limit
+    commands = [
+        sh("touch %s/%d; ls %s | wc -l; sleep 0.05; rm %s/%d" % (
+            running, i, running, running, i))
+        for i in range(6)
+    ]
+    outputs = run_redirected(tmp_path, commands, process_limit=2)
+    counts = [int(output) for output in outputs]
+    assert all(1 <= count <= 2 for count in counts), counts